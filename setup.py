@@ -11,6 +11,9 @@ setup(
         "networkx>=3.1",
         "click>=8.1.4"
     ],
+    extras_require={
+        "jit": ["numba>=0.57"],
+    },
     entry_points={
         "console_scripts": [
             "delivery-agent=main:cli",
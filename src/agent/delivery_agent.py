@@ -2,12 +2,15 @@
 Autonomous delivery agent with rationality constraints.
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Deque, Set
+from collections import OrderedDict, deque
 from enum import Enum
-from environment.grid import Grid, DynamicGrid
+from environment.grid import Grid
+from environment.obstacles import DynamicGrid
 from algorithms.uninformed_search import BFS, UniformCostSearch
 from algorithms.informed_search import AStarSearch
 from algorithms.local_search import HillClimbing, SimulatedAnnealing
+from algorithms.dstar_lite import DStarLite
 
 class AgentState(Enum):
     PLANNING = 1
@@ -18,16 +21,28 @@ class AgentState(Enum):
 class DeliveryAgent:
     """Autonomous delivery agent that navigates grid environment."""
     
+    # Planners whose result depends only on (start, goal, grid state)
+    CACHEABLE_PLANNERS = ('bfs', 'ucs', 'astar')
+    PLAN_CACHE_SIZE = 64
+    
     def __init__(self, start: Tuple[int, int], goal: Tuple[int, int], 
-                 grid: Grid, fuel: int = 100, time_limit: int = 100):
+                 grid: Grid, fuel: int = 100, time_limit: int = 100,
+                 local_search_workers: Optional[int] = None):
+        """
+        Args:
+            local_search_workers: Worker processes for hill-climbing restarts
+                (None: CPU count); pass 1 when the agent itself runs in a pool
+        """
         self.start = start
         self.goal = goal
         self.grid = grid
         self.fuel = fuel
         self.time_limit = time_limit
+        self.local_search_workers = local_search_workers
         
         self.position = start
-        self.path = []
+        # Remaining route, current position first; popleft() on every move
+        self.path: Deque[Tuple[int, int]] = deque()
         self.cost = 0
         self.time_elapsed = 0
         self.fuel_remaining = fuel
@@ -36,13 +51,49 @@ class DeliveryAgent:
         # Performance metrics
         self.replan_count = 0
         self.total_nodes_expanded = 0
+        
+        # Incremental replanning state, reset per delivery
+        self._dstar: Optional[DStarLite] = None
+        self._dynamic_blocked = set()
+        # A* planners by heuristic; each keeps its heuristic values for self.goal.
+        # Only A* replans reuse them, i.e. run_delivery without a dynamic grid.
+        self._astar_planners: Dict[str, AStarSearch] = {}
+        
+        # LRU of (algorithm, heuristic, start, goal) -> (fingerprint, path, cost)
+        self._plan_cache: OrderedDict = OrderedDict()
+    
+    def _blocked_fingerprint(self) -> Tuple[int, int]:
+        """Cheap identity of the blocked-tile state the planners see."""
+        return self.grid.version, hash(frozenset(self._dynamic_blocked))
+    
+    def _cached_search(self, algorithm: str, planner, **kwargs) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Run planner.search, reusing an earlier result for the same query."""
+        if algorithm not in self.CACHEABLE_PLANNERS:
+            return planner.search(self.position, self.goal)
+        
+        key = (algorithm, kwargs.get('heuristic', 'manhattan'), self.position, self.goal)
+        fingerprint = self._blocked_fingerprint()
+        entry = self._plan_cache.get(key)
+        if entry is not None:
+            if entry[0] == fingerprint:
+                self._plan_cache.move_to_end(key)
+                return list(entry[1]), entry[2], 0
+            del self._plan_cache[key]
+        
+        path, path_cost, nodes_expanded = planner.search(self.position, self.goal)
+        self._plan_cache[key] = (fingerprint, path, path_cost)
+        if len(self._plan_cache) > self.PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return list(path), path_cost, nodes_expanded
     
     def plan_path(self, algorithm: str, **kwargs) -> bool:
         """Plan initial path using specified algorithm."""
         planner = self._get_planner(algorithm, **kwargs)
         
         if planner:
-            self.path, path_cost, nodes_expanded = planner.search(self.position, self.goal)
+            path, path_cost, nodes_expanded = self._cached_search(algorithm, planner, **kwargs)
+            # Local search returns None when it finds no path at all
+            self.path = deque(path or ())
             self.total_nodes_expanded += nodes_expanded
             
             if self.path:
@@ -55,14 +106,24 @@ class DeliveryAgent:
     
     def _get_planner(self, algorithm: str, **kwargs):
         """Get appropriate path planner."""
+        if algorithm == 'astar':
+            # Reused by A* replans (no dynamic grid); D* Lite measures its
+            # heuristic from the moving start, so it cannot share these values
+            heuristic = kwargs.get('heuristic', 'manhattan')
+            if heuristic not in self._astar_planners:
+                self._astar_planners[heuristic] = AStarSearch(self.grid, heuristic)
+            return self._astar_planners[heuristic]
+        
+        if algorithm == 'hillclimbing':
+            return HillClimbing(self.grid, workers=self.local_search_workers)
+        
         planners = {
-            'bfs': BFS(self.grid),
-            'ucs': UniformCostSearch(self.grid),
-            'astar': AStarSearch(self.grid, kwargs.get('heuristic', 'manhattan')),
-            'hillclimbing': HillClimbing(self.grid),
-            'annealing': SimulatedAnnealing(self.grid)
+            'bfs': BFS,
+            'ucs': UniformCostSearch,
+            'annealing': SimulatedAnnealing
         }
-        return planners.get(algorithm)
+        planner_class = planners.get(algorithm)
+        return planner_class(self.grid) if planner_class else None
     
     def move(self) -> bool:
         """Move one step along the planned path."""
@@ -87,23 +148,29 @@ class DeliveryAgent:
         self.cost += move_cost
         self.fuel_remaining -= move_cost
         self.time_elapsed += 1
-        self.path = self.path[1:]  # Remove current position from path
+        self.path.popleft()  # Remove previous position from path
         
         print(f"Move to {self.position}, Cost: {move_cost}, Total: {self.cost}")
         return True
     
-    def check_for_replan(self, dynamic_grid: Optional[DynamicGrid] = None) -> bool:
-        """Check if replanning is necessary."""
+    def check_for_replan(self, dynamic_grid: Optional[DynamicGrid] = None,
+                         occupied: Optional[Dict[int, Set[Tuple[int, int]]]] = None) -> bool:
+        """Check if replanning is necessary.
+        
+        occupied is the _route_occupancy of dynamic_grid, if already computed.
+        """
         if not self.path:
             return True
         
         # Check if path is blocked by dynamic obstacles
         if dynamic_grid:
-            for i, (x, y) in enumerate(self.path):
-                future_time = self.time_elapsed + i
-                if not dynamic_grid.is_traversable(x, y, future_time):
-                    print(f"Dynamic obstacle detected at {(x, y)} at time {future_time}")
-                    return True
+            if occupied is None:
+                occupied = self._route_occupancy(dynamic_grid)
+            blocked = self._blocked_path_steps(dynamic_grid, occupied)
+            if blocked:
+                x, y, future_time = blocked[0]
+                print(f"Dynamic obstacle detected at {(x, y)} at time {future_time}")
+                return True
         
         # Check if we're stuck
         if len(self.path) > 1 and self.path[1] == self.position:
@@ -111,8 +178,27 @@ class DeliveryAgent:
         
         return False
     
-    def replan(self, algorithm: str = 'astar', **kwargs) -> bool:
-        """Replan path from current position."""
+    def _route_occupancy(self, dynamic_grid: DynamicGrid) -> Dict[int, Set[Tuple[int, int]]]:
+        """Moving-obstacle cells at each time step of the remaining route."""
+        start_time = self.time_elapsed
+        return dynamic_grid.occupied_cells(range(start_time, start_time + len(self.path)))
+    
+    def _blocked_path_steps(self, dynamic_grid: DynamicGrid,
+                            occupied: Dict[int, Set[Tuple[int, int]]]) -> List[Tuple[int, int, int]]:
+        """Get (x, y, arrival time) for path cells that are blocked when reached."""
+        start_time = self.time_elapsed
+        base_grid = dynamic_grid.base_grid
+        return [(x, y, start_time + i) for i, (x, y) in enumerate(self.path)
+                if (x, y) in occupied[start_time + i] or not base_grid.is_traversable(x, y)]
+    
+    def replan(self, algorithm: str = 'astar', dynamic_grid: Optional[DynamicGrid] = None,
+               occupied: Optional[Dict[int, Set[Tuple[int, int]]]] = None, **kwargs) -> bool:
+        """Replan path from current position.
+        
+        Local search algorithms repair the current path. Otherwise, when a
+        dynamic grid is given, the persistent D* Lite planner is updated with
+        the newly blocked tiles instead of searching from scratch.
+        """
         self.replan_count += 1
         print(f"Replanning attempt {self.replan_count} with {algorithm}")
         
@@ -121,36 +207,87 @@ class DeliveryAgent:
             planner = self._get_planner(algorithm, **kwargs)
             if isinstance(planner, (HillClimbing, SimulatedAnnealing)):
                 new_path, new_cost, nodes_expanded = planner.search(
-                    self.position, self.goal, self.path)
+                    self.position, self.goal, list(self.path))
                 self.total_nodes_expanded += nodes_expanded
                 
                 if new_path:
-                    self.path = new_path
+                    self.path = deque(new_path)
                     print(f"Replanning successful: new cost={new_cost}")
                     return True
+        elif dynamic_grid is not None:
+            return self._replan_incremental(dynamic_grid, occupied)
         else:
             # Use complete search algorithm
             return self.plan_path(algorithm, **kwargs)
         
         return False
     
+    def _replan_incremental(self, dynamic_grid: DynamicGrid,
+                            occupied: Optional[Dict[int, Set[Tuple[int, int]]]] = None) -> bool:
+        """Repair the plan with D* Lite around tiles blocked on the current path."""
+        if occupied is None:
+            occupied = self._route_occupancy(dynamic_grid)
+        if self._dstar is None:
+            self._dstar = DStarLite(self.grid)
+            _, _, nodes_expanded = self._dstar.initialize(self.position, self.goal)
+            self.total_nodes_expanded += nodes_expanded
+        
+        blocked = {(x, y) for x, y, _ in self._blocked_path_steps(dynamic_grid, occupied)}
+        
+        # Earlier blocks stay only while an obstacle still visits the cell
+        # within the remaining route's time window
+        blocked |= self._dynamic_blocked & set().union(*occupied.values())
+        blocked -= {self.position, self.goal}
+        
+        changed = [(cell, True) for cell in blocked - self._dynamic_blocked]
+        changed += [(cell, False) for cell in self._dynamic_blocked - blocked]
+        self._dynamic_blocked = blocked
+        
+        new_path, new_cost, nodes_expanded = self._dstar.replan(self.position, changed)
+        self.total_nodes_expanded += nodes_expanded
+        
+        if not new_path and self._dynamic_blocked:
+            # Detected obstacles seal off the goal; fall back to the static route
+            print("No path around dynamic obstacles - ignoring them")
+            cleared = [(cell, False) for cell in self._dynamic_blocked]
+            self._dynamic_blocked.clear()
+            new_path, new_cost, nodes_expanded = self._dstar.replan(self.position, cleared)
+            self.total_nodes_expanded += nodes_expanded
+        
+        if new_path:
+            self.path = deque(new_path)
+            print(f"Replanning successful: new cost={new_cost}")
+            return True
+        return False
+    
     def run_delivery(self, algorithm: str, dynamic_grid: Optional[DynamicGrid] = None, 
-                    replan_algorithm: str = 'astar') -> Dict:
-        """Execute complete delivery mission."""
+                    replan_algorithm: str = 'astar', heuristic: str = 'manhattan') -> Dict:
+        """Execute complete delivery mission.
+        
+        heuristic selects the A* heuristic. With a dynamic grid, replans go
+        through D* Lite, which uses its own Manhattan heuristic, so it then
+        only affects the initial plan.
+        """
         print(f"Starting delivery from {self.start} to {self.goal}")
+        self._dstar = None
+        self._dynamic_blocked = set()
+        self._astar_planners = {}
         
         # Initial planning
-        if not self.plan_path(algorithm):
+        if not self.plan_path(algorithm, heuristic=heuristic):
             return self._get_metrics(success=False)
         
         self.state = AgentState.MOVING
         
         # Execution loop
         while self.position != self.goal and self.time_elapsed < self.time_limit:
+            # Obstacle positions along the remaining route, shared by the check and the replan
+            occupied = self._route_occupancy(dynamic_grid) if dynamic_grid else None
+            
             # Check if replanning is needed
-            if self.check_for_replan(dynamic_grid):
+            if self.check_for_replan(dynamic_grid, occupied):
                 self.state = AgentState.REPLANNING
-                if not self.replan(replan_algorithm):
+                if not self.replan(replan_algorithm, dynamic_grid, occupied, heuristic=heuristic):
                     print("Replanning failed - mission aborted")
                     return self._get_metrics(success=False)
                 self.state = AgentState.MOVING
@@ -0,0 +1,172 @@
+"""
+Incremental replanning: D* Lite (Koenig & Likhachev, 2002).
+"""
+
+import heapq
+from typing import Iterable, List, Tuple
+import numpy as np
+from environment.grid import Grid
+
+class DStarLite:
+    """D* Lite planner that repairs its previous search instead of starting over.
+
+    The search runs backwards from the goal, so g-values stay valid when the
+    agent moves; a replan only re-expands the nodes whose cost-to-goal was
+    affected by the changed cells. Cells are addressed by flat node id
+    (y * width + x). A cell marked blocked cannot be entered, on top of the
+    grid's static obstacles.
+    """
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.nodes_expanded = 0
+
+    def initialize(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Plan from scratch.
+
+        Returns:
+            Tuple of (path, cost, nodes_expanded)
+        """
+        width = self.grid.width
+        size = width * self.grid.height
+
+        self.g = np.full(size, np.inf, dtype=np.float32)
+        self.rhs = np.full(size, np.inf, dtype=np.float32)
+        self.blocked = np.zeros(size, dtype=np.bool_)
+        self.km = 0.0
+
+        self.start_id = start[1] * width + start[0]
+        self.goal_id = goal[1] * width + goal[0]
+        self._last_id = self.start_id
+
+        self._open = []
+        self._open_key = {}  # node id -> key of its live queue entry
+
+        self.rhs[self.goal_id] = 0
+        self._push(self.goal_id)
+        return self._compute_shortest_path()
+
+    def replan(self, start: Tuple[int, int],
+               changed_edges: Iterable[Tuple[Tuple[int, int], bool]] = ()) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Repair the plan after the agent moved to start and/or cells changed.
+
+        Args:
+            start: Current agent position
+            changed_edges: (cell, blocked) pairs for cells whose traversability
+                changed since the last call
+
+        Returns:
+            Tuple of (path, cost, nodes_expanded)
+        """
+        width = self.grid.width
+        self.start_id = start[1] * width + start[0]
+        self.km += self._heuristic(self._last_id, self.start_id)
+        self._last_id = self.start_id
+
+        for (x, y), is_blocked in changed_edges:
+            cell = y * width + x
+            if self.blocked[cell] == is_blocked:
+                continue
+            self.blocked[cell] = is_blocked
+            # Only the edges entering the cell change cost
+            for px, py in self.grid.neighbors[cell]:
+                self._update_vertex(py * width + px)
+
+        return self._compute_shortest_path()
+
+    def _heuristic(self, a: int, b: int) -> float:
+        """Manhattan distance between two node ids."""
+        ay, ax = divmod(a, self.grid.width)
+        by, bx = divmod(b, self.grid.width)
+        return abs(ax - bx) + abs(ay - by)
+
+    def _calculate_key(self, node: int) -> Tuple[float, float]:
+        """Priority of a node: (min(g, rhs) + h + km, min(g, rhs))."""
+        best = float(min(self.g[node], self.rhs[node]))
+        return (best + self._heuristic(self.start_id, node) + self.km, best)
+
+    def _push(self, node: int):
+        """Insert or re-key a node in the open queue."""
+        key = self._calculate_key(node)
+        self._open_key[node] = key
+        heapq.heappush(self._open, (key, node))
+
+    def _successors(self, node: int):
+        """Yield (successor id, cost of entering it) for enterable neighbors."""
+        width = self.grid.width
+        cost = self.grid.cost
+        for nx, ny in self.grid.neighbors[node]:
+            successor = ny * width + nx
+            if not self.blocked[successor]:
+                yield successor, cost[ny, nx]
+
+    def _update_vertex(self, node: int):
+        """Recompute rhs for a node and fix its queue membership."""
+        if node != self.goal_id:
+            best = np.inf
+            for successor, step_cost in self._successors(node):
+                best = min(best, step_cost + self.g[successor])
+            self.rhs[node] = best
+
+        # Any queued entry for the node becomes stale
+        self._open_key.pop(node, None)
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+
+    def _compute_shortest_path(self) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Expand inconsistent nodes until the start is consistent."""
+        width = self.grid.width
+        start = self.start_id
+        self.nodes_expanded = 0
+
+        while self._open:
+            key, node = self._open[0]
+            if self._open_key.get(node) != key:
+                heapq.heappop(self._open)
+                continue
+            if key >= self._calculate_key(start) and self.rhs[start] <= self.g[start]:
+                break
+
+            heapq.heappop(self._open)
+            del self._open_key[node]
+            self.nodes_expanded += 1
+
+            new_key = self._calculate_key(node)
+            if key < new_key:
+                self._push(node)
+            elif self.g[node] > self.rhs[node]:
+                self.g[node] = self.rhs[node]
+                for px, py in self.grid.neighbors[node]:
+                    self._update_vertex(py * width + px)
+            else:
+                self.g[node] = np.inf
+                self._update_vertex(node)
+                for px, py in self.grid.neighbors[node]:
+                    self._update_vertex(py * width + px)
+
+        return self._extract_path()
+
+    def _extract_path(self) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Follow the cheapest successors from the start to the goal."""
+        # rhs is the one-step lookahead on g; it is exact for the start on exit
+        if self.rhs[self.start_id] == np.inf:
+            return [], float('inf'), self.nodes_expanded
+
+        width = self.grid.width
+        node = self.start_id
+        y, x = divmod(node, width)
+        path = [(x, y)]
+
+        while node != self.goal_id:
+            best, best_cost = -1, np.inf
+            for successor, step_cost in self._successors(node):
+                total = step_cost + self.g[successor]
+                if total < best_cost:
+                    best, best_cost = successor, total
+            if best == -1 or len(path) > len(self.g):
+                return [], float('inf'), self.nodes_expanded
+            node = best
+            y, x = divmod(node, width)
+            path.append((x, y))
+
+        return path, self.grid.path_cost(path), self.nodes_expanded
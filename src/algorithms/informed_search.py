@@ -3,15 +3,212 @@ Informed search algorithms: A* with various heuristics.
 """
 
 import heapq
-from typing import List, Tuple, Callable
-from algorithms.uninformed_search import UninformedSearch, Node
+import math
+import weakref
+from collections import OrderedDict
+from typing import List, Tuple, Callable, Optional
+import numpy as np
+from algorithms.uninformed_search import UninformedSearch
+from environment.grid import BLOCKED_COST
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the search core then runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Heuristic ids understood by _h
+_HEURISTIC_IDS = {'manhattan': 0, 'euclidean': 1, 'chebyshev': 2}
+
+@njit(cache=True, inline='always')
+def _h(h_id, x1, y1, x2, y2):
+    """Heuristic selected by id; Manhattan and Chebyshev stay in integer math."""
+    dx = x1 - x2
+    if dx < 0:
+        dx = -dx
+    dy = y1 - y2
+    if dy < 0:
+        dy = -dy
+    if h_id == 1:
+        return math.sqrt(dx * dx + dy * dy)
+    if h_id == 2:
+        return dx if dx > dy else dy
+    return dx + dy
+
+@njit(cache=True, inline='always')
+def _astar_core(cost_arr, sx, sy, gx, gy, h_id, h_cache):
+    """A* over flat node ids (y * width + x).
+    
+    h_cache holds the heuristic to (gx, gy) per node id, -1 where not yet
+    computed; it is filled in place so callers can reuse it for later
+    searches toward the same goal.
+    
+    Obstacles are recognised by BLOCKED_COST in cost_arr. With the integer
+    heuristics (Manhattan, Chebyshev) f-values are integers that never drop
+    below the last popped f nor exceed it by more than max_step + 1, so the
+    open set is a circular bucket queue (Dial's algorithm) with O(1) push and
+    pop. Each bucket is a stack threaded through preallocated entry arrays.
+    Euclidean f-values are fractional and use a binary heap.
+    
+    Returns:
+        Tuple of (parent array, goal id or -1 if unreachable, path cost, nodes_expanded)
+    """
+    height, width = cost_arr.shape
+    size = width * height
+    
+    g_score = np.full(size, np.inf, dtype=np.float32)
+    parent = np.full(size, -1, dtype=np.int32)
+    closed = np.zeros(size, dtype=np.bool_)
+    
+    start_id = sy * width + sx
+    goal_id = gy * width + gx
+    g_score[start_id] = 0.0
+    h_start = _h(h_id, sx, sy, gx, gy)
+    nodes_expanded = 0
+    
+    use_buckets = h_id != 1
+    open_set = [(float(h_start), start_id)]
+    
+    max_step = 1
+    for c in cost_arr.ravel():
+        if c != BLOCKED_COST and c > max_step:
+            max_step = int(c)
+    num_buckets = max_step + 2
+    bucket_head = np.full(num_buckets, -1, dtype=np.int64)
+    # A node is pushed at most once per expanded neighbor
+    entry_node = np.empty(4 * size + 1, dtype=np.int64)
+    entry_next = np.empty(4 * size + 1, dtype=np.int64)
+    num_entries = 0
+    num_queued = 0
+    min_f = int(h_start)
+    if use_buckets:
+        open_set.pop()  # the heap stays empty; its seed entry only fixes the list type for Numba
+        entry_node[0] = start_id
+        entry_next[0] = -1
+        bucket_head[min_f % num_buckets] = 0
+        num_entries = 1
+        num_queued = 1
+    
+    while num_queued > 0 or open_set:
+        if use_buckets:
+            while bucket_head[min_f % num_buckets] == -1:
+                min_f += 1
+            bucket = min_f % num_buckets
+            entry = bucket_head[bucket]
+            bucket_head[bucket] = entry_next[entry]
+            current = entry_node[entry]
+            num_queued -= 1
+        else:
+            current_f, current = heapq.heappop(open_set)
+        
+        if closed[current]:
+            continue
+        closed[current] = True
+        nodes_expanded += 1
+        
+        if current == goal_id:
+            return parent, goal_id, g_score[goal_id], nodes_expanded
+        
+        cy, cx = divmod(current, width)
+        current_g = g_score[current]
+        for k in range(4):
+            # Up, Right, Down, Left
+            nx, ny = cx, cy
+            if k == 0:
+                ny += 1
+            elif k == 1:
+                nx += 1
+            elif k == 2:
+                ny -= 1
+            else:
+                nx -= 1
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            step_cost = cost_arr[ny, nx]
+            if step_cost == BLOCKED_COST:
+                continue
+            
+            successor = ny * width + nx
+            if closed[successor]:
+                continue
+            
+            tentative_g = current_g + step_cost
+            if tentative_g < g_score[successor]:
+                g_score[successor] = tentative_g
+                parent[successor] = current
+                
+                h_value = h_cache[successor]
+                if h_value < 0:
+                    h_value = _h(h_id, nx, ny, gx, gy)
+                    h_cache[successor] = h_value
+                f_value = tentative_g + h_value
+                if use_buckets:
+                    bucket = int(f_value) % num_buckets
+                    entry_node[num_entries] = successor
+                    entry_next[num_entries] = bucket_head[bucket]
+                    bucket_head[bucket] = num_entries
+                    num_entries += 1
+                    num_queued += 1
+                else:
+                    heapq.heappush(open_set, (float(f_value), successor))
+    
+    return parent, -1, np.inf, nodes_expanded
+
+# Per-heuristic entry points. _astar_core is inlined into each with a literal
+# h_id, so the heuristic and queue-type branches are folded away at compile time.
+@njit(cache=True)
+def _astar_core_manhattan(cost_arr, sx, sy, gx, gy, h_cache):
+    return _astar_core(cost_arr, sx, sy, gx, gy, 0, h_cache)
+
+@njit(cache=True)
+def _astar_core_euclidean(cost_arr, sx, sy, gx, gy, h_cache):
+    return _astar_core(cost_arr, sx, sy, gx, gy, 1, h_cache)
+
+@njit(cache=True)
+def _astar_core_chebyshev(cost_arr, sx, sy, gx, gy, h_cache):
+    return _astar_core(cost_arr, sx, sy, gx, gy, 2, h_cache)
+
+_ASTAR_CORES = (_astar_core_manhattan, _astar_core_euclidean, _astar_core_chebyshev)
+
+@njit(cache=True)
+def _trace_path(parent, goal_id, width):
+    """Follow parent ids back from goal_id; returns an (L, 2) int32 array of (x, y)."""
+    length = 0
+    node = goal_id
+    while node != -1:
+        length += 1
+        node = parent[node]
+    
+    path = np.empty((length, 2), dtype=np.int32)
+    node = goal_id
+    for i in range(length - 1, -1, -1):
+        path[i, 0] = node % width
+        path[i, 1] = node // width
+        node = parent[node]
+    return path
 
 class AStarSearch(UninformedSearch):
-    """A* Search implementation with configurable heuristics."""
+    """A* Search implementation with configurable heuristics.
+    
+    Results are shared across instances through a per-grid LRU cache keyed
+    by (grid version, heuristic, start, goal), so repeated queries on an
+    unchanged grid skip the search. Each instance also keeps the heuristic
+    values computed for its last goal; they do not depend on the grid state,
+    so replans toward the same goal reuse them.
+    """
+    
+    CACHE_SIZE = 128
+    _path_cache = weakref.WeakKeyDictionary()
     
     def __init__(self, grid, heuristic: str = 'manhattan'):
         super().__init__(grid)
         self.heuristic = self._get_heuristic_function(heuristic)
+        self._h_id = _HEURISTIC_IDS.get(heuristic, 0)
+        self._core = _ASTAR_CORES[self._h_id]
+        self._h_cache: Optional[np.ndarray] = None
+        self._h_goal: Optional[Tuple[int, int]] = None
     
     def _get_heuristic_function(self, heuristic: str) -> Callable:
         """Get heuristic function by name."""
@@ -34,43 +231,45 @@ class AStarSearch(UninformedSearch):
         """Chebyshev distance heuristic."""
         return max(abs(x1 - x2), abs(y1 - y2))
     
+    def _heuristic_cache(self, goal: Tuple[int, int]) -> np.ndarray:
+        """Per-node heuristic values toward goal, reset when the goal changes."""
+        size = self.grid.width * self.grid.height
+        if self._h_goal != goal or self._h_cache is None or len(self._h_cache) != size:
+            self._h_cache = np.full(size, -1.0, dtype=np.float32)
+            self._h_goal = goal
+        return self._h_cache
+    
     def search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], int, int]:
-        """Perform A* search."""
-        start_node = Node(start[0], start[1])
-        goal_node = Node(goal[0], goal[1])
-        
-        open_set = []
-        heapq.heappush(open_set, (0, start_node))
+        """Perform A* search.
         
-        g_score = {}
-        g_score[(start_node.x, start_node.y)] = 0
+        The search loop and path tracing run in code specialized for this
+        heuristic (JIT-compiled when Numba is installed); this wrapper only
+        converts the traced path to tuples and manages the result cache.
+        """
+        # The compiled core indexes its arrays by start and goal id unchecked
+        if not (self.grid.is_valid_position(*start) and self.grid.is_valid_position(*goal)):
+            self.nodes_expanded = 0
+            return [], float('inf'), self.nodes_expanded
         
-        f_score = {}
-        h_start = self.heuristic(start[0], start[1], goal[0], goal[1])
-        f_score[(start_node.x, start_node.y)] = h_start
+        cache = self._path_cache.setdefault(self.grid, OrderedDict())
+        key = (self.grid.version, self._h_id, tuple(start), tuple(goal))
+        if key in cache:
+            cache.move_to_end(key)
+            path, path_cost = cache[key]
+            self.nodes_expanded = 0
+            return list(path), path_cost, self.nodes_expanded
         
-        self.nodes_expanded = 0
+        parent, goal_id, path_cost, self.nodes_expanded = self._core(
+            self.grid.cost, start[0], start[1], goal[0], goal[1],
+            self._heuristic_cache(tuple(goal)))
         
-        while open_set:
-            current_f, current = heapq.heappop(open_set)
-            self.nodes_expanded += 1
-            
-            if current == goal_node:
-                path = self.reconstruct_path(current)
-                return path, current.cost, self.nodes_expanded
-            
-            for successor in self.get_successors(current):
-                tentative_g = g_score[(current.x, current.y)] + self.grid.get_cost(successor.x, successor.y)
-                
-                if (successor.x, successor.y) not in g_score or tentative_g < g_score[(successor.x, successor.y)]:
-                    successor.parent = current
-                    successor.cost = tentative_g
-                    g_score[(successor.x, successor.y)] = tentative_g
-                    
-                    h_value = self.heuristic(successor.x, successor.y, goal[0], goal[1])
-                    f_value = tentative_g + h_value
-                    f_score[(successor.x, successor.y)] = f_value
-                    
-                    heapq.heappush(open_set, (f_value, successor))
+        if goal_id == -1:
+            path, path_cost = [], float('inf')
+        else:
+            path = [tuple(p) for p in _trace_path(parent, goal_id, self.grid.width).tolist()]
+            path_cost = int(path_cost)
         
-        return [], float('inf'), self.nodes_expanded
+        cache[key] = (path, path_cost)
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+        return list(path), path_cost, self.nodes_expanded
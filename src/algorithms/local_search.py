@@ -2,93 +2,221 @@
 Local search algorithms for dynamic replanning.
 """
 
+import os
 import random
 import math
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Optional
+import numpy as np
 from environment.grid import Grid
 from algorithms.uninformed_search import Node
 
+# Planner of the current worker process, installed once by _init_worker
+_worker_planner: Optional['HillClimbing'] = None
+
+def _init_worker(planner: 'HillClimbing'):
+    """Pool initializer: receive the planner (and its grid) once per worker."""
+    global _worker_planner
+    _worker_planner = planner
+
+def _run_restart_in_worker(seed: int, start: Tuple[int, int], goal: Tuple[int, int],
+                           initial_path: Optional[List[Tuple[int, int]]]):
+    """Run one restart on the worker's planner; tasks only carry their arguments."""
+    return _worker_planner._run_one_restart(seed, start, goal, initial_path)
+
+def _to_tuples(path: np.ndarray) -> List[Tuple[int, int]]:
+    """Convert an (L, 2) path array back to the public list-of-tuples form."""
+    return [tuple(p) for p in path.tolist()]
+
+def _ends_at(path: np.ndarray, goal: Tuple[int, int]) -> bool:
+    """Whether a non-empty (L, 2) path array ends on the goal cell."""
+    return path[-1, 0] == goal[0] and path[-1, 1] == goal[1]
+
 class HillClimbing:
-    """Hill Climbing with random restarts for path optimization."""
+    """Hill Climbing with random restarts for path optimization.
     
-    def __init__(self, grid: Grid, max_restarts: int = 10, max_iterations: int = 100):
+    Restarts are independent trajectories from the initial path (or a fresh
+    random path); the cheapest result wins. Each restart draws from its own
+    random.Random seeded from self.rng, so results do not depend on the
+    number of workers. Searches with at least PARALLEL_MIN_ITERATIONS total
+    iterations run their restarts in a process pool created for that search;
+    smaller ones run inline, where pool startup would cost more than it saves.
+    The defaults (10 x 100 iterations, a few milliseconds of work) are meant
+    to stay inline: a forked two-worker pool alone takes about 10 ms to start.
+    """
+    
+    PARALLEL_MIN_ITERATIONS = 20000
+    
+    def __init__(self, grid: Grid, max_restarts: int = 10, max_iterations: int = 100,
+                 workers: Optional[int] = None, seed: Optional[int] = None):
         self.grid = grid
         self.max_restarts = max_restarts
         self.max_iterations = max_iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
     
     def get_path_cost(self, path: List[Tuple[int, int]]) -> int:
         """Calculate total cost of a path."""
-        cost = 0
-        for i in range(len(path) - 1):
-            x, y = path[i + 1]
-            cost += self.grid.get_cost(x, y)
-        return cost
+        return self.grid.path_cost(path)
     
     def generate_random_path(self, start: Tuple[int, int], goal: Tuple[int, int], 
-                           max_length: int = 50) -> Optional[List[Tuple[int, int]]]:
+                           max_length: int = 50, 
+                           rng: Optional[random.Random] = None) -> Optional[List[Tuple[int, int]]]:
         """Generate a random valid path using random walks."""
+        rng = rng or self.rng
+        neighbors = self.grid.neighbors
+        width = self.grid.width
         path = [start]
         current = start
-        visited = set([start])
+        visited = np.zeros(width * self.grid.height, dtype=np.uint8)
+        visited[start[1] * width + start[0]] = 1
         
         for _ in range(max_length):
-            neighbors = [n for n in self.grid.get_neighbors(current[0], current[1]) 
-                        if self.grid.is_traversable(n[0], n[1]) and n not in visited]
+            # neighbors[] already excludes obstacles; only filter visited cells
+            candidates = []
+            for nx, ny in neighbors[current[1] * width + current[0]]:
+                if not visited[ny * width + nx]:
+                    candidates.append((nx, ny))
             
-            if not neighbors:
+            if not candidates:
                 break
                 
-            next_pos = random.choice(neighbors)
-            path.append(next_pos)
-            visited.add(next_pos)
-            current = next_pos
+            current = candidates[rng.randrange(len(candidates))]
+            path.append(current)
+            visited[current[1] * width + current[0]] = 1
             
             if current == goal:
                 return path
         
         return None
     
-    def mutate_path(self, path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        """Mutate a path by replacing a segment with a random walk."""
+    def mutate_path(self, path, rng: Optional[random.Random] = None) -> np.ndarray:
+        """Mutate a path by replacing a segment with a random walk.
+        
+        Accepts a list of tuples or an (L, 2) int32 array and returns an
+        (L, 2) int32 array; the splice is a single concatenate.
+        """
+        rng = rng or self.rng
+        path = np.asarray(path, dtype=np.int32)
         if len(path) < 3:
             return path
         
         # Choose a random segment to replace
-        start_idx = random.randint(0, len(path) - 2)
-        end_idx = random.randint(start_idx + 1, len(path) - 1)
+        start_idx = rng.randint(0, len(path) - 2)
+        end_idx = rng.randint(start_idx + 1, len(path) - 1)
         
-        new_segment = self._find_alternative_route(path[start_idx], path[end_idx], end_idx - start_idx)
+        new_segment = self._find_alternative_route(tuple(path[start_idx].tolist()), 
+                                                   tuple(path[end_idx].tolist()), 
+                                                   end_idx - start_idx)
         if new_segment:
-            return path[:start_idx] + new_segment + path[end_idx + 1:]
+            return np.concatenate((path[:start_idx + 1], 
+                                   np.array(new_segment, dtype=np.int32), 
+                                   path[end_idx + 1:]))
         
         return path
     
+    def mutate_path_batch(self, path, k: int) -> List[np.ndarray]:
+        """Generate k independent mutations of a path as (L, 2) int32 arrays."""
+        path = np.asarray(path, dtype=np.int32)
+        return [self.mutate_path(path) for _ in range(k)]
+    
     def _find_alternative_route(self, start: Tuple[int, int], end: Tuple[int, int], 
                               max_steps: int) -> Optional[List[Tuple[int, int]]]:
-        """Find an alternative route between two points."""
-        # Simple BFS for short alternative routes
-        from collections import deque
+        """Find an alternative route between two points.
         
-        queue = deque([(start, [start])])
-        visited = set([start])
+        Bidirectional BFS: each round expands one level of whichever side has
+        the smaller frontier, and the route is stitched from the two parent
+        maps where the searches meet.
+        """
+        if start == end:
+            return None
         
-        while queue and len(visited) < 100:  # Limit search
-            current, path = queue.popleft()
+        neighbors = self.grid.neighbors
+        width = self.grid.width
+        
+        parents_fwd = {start: None}
+        parents_bwd = {end: None}
+        frontier_fwd = [start]
+        frontier_bwd = [end]
+        depth = 0
+        
+        # Allow slight detour; limit search
+        while (frontier_fwd and frontier_bwd and depth < max_steps + 2 and
+               len(parents_fwd) + len(parents_bwd) < 100):
+            forward = len(frontier_fwd) <= len(frontier_bwd)
+            frontier = frontier_fwd if forward else frontier_bwd
+            parents, others = (parents_fwd, parents_bwd) if forward else (parents_bwd, parents_fwd)
             
-            if len(path) > max_steps + 2:  # Allow slight detour
-                continue
-                
-            if current == end:
-                return path[1:]  # Exclude start
+            next_frontier = []
+            for current in frontier:
+                for neighbor in neighbors[current[1] * width + current[0]]:
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = current
+                    if neighbor in others:
+                        return self._join_routes(neighbor, parents_fwd, parents_bwd)
+                    next_frontier.append(neighbor)
             
-            for neighbor in self.grid.get_neighbors(current[0], current[1]):
-                if (self.grid.is_traversable(neighbor[0], neighbor[1]) and 
-                    neighbor not in visited):
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+            if forward:
+                frontier_fwd = next_frontier
+            else:
+                frontier_bwd = next_frontier
+            depth += 1
         
         return None
     
+    def _join_routes(self, meet: Tuple[int, int], parents_fwd: dict, 
+                     parents_bwd: dict) -> List[Tuple[int, int]]:
+        """Stitch the forward and backward halves at the meeting cell, excluding start."""
+        route = []
+        node = meet
+        while node is not None:
+            route.append(node)
+            node = parents_fwd[node]
+        route.reverse()
+        
+        node = parents_bwd[meet]
+        while node is not None:
+            route.append(node)
+            node = parents_bwd[node]
+        
+        return route[1:]
+    
+    def _run_one_restart(self, seed: int, start: Tuple[int, int], goal: Tuple[int, int], 
+                         initial_path: Optional[List[Tuple[int, int]]]) -> Tuple[Optional[List[Tuple[int, int]]], float, int]:
+        """Climb from the initial path, or a random one, with a dedicated RNG.
+        
+        Returns:
+            Tuple of (path, cost, nodes_evaluated)
+        """
+        rng = random.Random(seed)
+        if initial_path is None:
+            current_path = self.generate_random_path(start, goal, rng=rng)
+        else:
+            current_path = initial_path
+        
+        if not current_path:
+            return None, float('inf'), 0
+        
+        current_path = np.asarray(current_path, dtype=np.int32)
+        current_cost = self.get_path_cost(current_path)
+        nodes_evaluated = 1
+        
+        for iteration in range(self.max_iterations):
+            # Generate neighbor by mutation
+            new_path = self.mutate_path(current_path, rng)
+            if not _ends_at(new_path, goal):
+                continue
+            
+            new_cost = self.get_path_cost(new_path)
+            nodes_evaluated += 1
+            
+            if new_cost < current_cost:
+                current_path = new_path
+                current_cost = new_cost
+        
+        return _to_tuples(current_path), current_cost, nodes_evaluated
+    
     def search(self, start: Tuple[int, int], goal: Tuple[int, int], 
                initial_path: List[Tuple[int, int]] = None) -> Tuple[List[Tuple[int, int]], int, int]:
         """Perform hill climbing search with random restarts."""
@@ -96,72 +224,69 @@ class HillClimbing:
         best_cost = float('inf') if not initial_path else self.get_path_cost(initial_path)
         nodes_evaluated = 0
         
-        for restart in range(self.max_restarts):
-            if best_path is None:
-                current_path = self.generate_random_path(start, goal)
-            else:
-                current_path = best_path.copy()
-            
-            if not current_path:
-                continue
-                
-            current_cost = self.get_path_cost(current_path)
-            nodes_evaluated += 1
-            
-            for iteration in range(self.max_iterations):
-                # Generate neighbor by mutation
-                new_path = self.mutate_path(current_path)
-                if not new_path or new_path[-1] != goal:
-                    continue
-                
-                new_cost = self.get_path_cost(new_path)
-                nodes_evaluated += 1
-                
-                if new_cost < current_cost:
-                    current_path = new_path
-                    current_cost = new_cost
-                
-                if current_cost < best_cost:
-                    best_path = current_path
-                    best_cost = current_cost
+        seeds = [self.rng.getrandbits(32) for _ in range(self.max_restarts)]
+        workers = min(self.workers, self.max_restarts)
+        if workers < 2 or self.max_restarts * self.max_iterations < self.PARALLEL_MIN_ITERATIONS:
+            results = [self._run_one_restart(seed, start, goal, initial_path) for seed in seeds]
+        else:
+            # Pure-Python work holds the GIL, so restarts go to processes, not threads.
+            # The grid is shipped once per worker, and the pool is shut down on exit.
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                futures = [executor.submit(_run_restart_in_worker, seed, start, goal, initial_path)
+                           for seed in seeds]
+                results = [future.result() for future in futures]
+        
+        for path, cost, evaluated in results:
+            nodes_evaluated += evaluated
+            if path and cost < best_cost:
+                best_path = path
+                best_cost = cost
         
         return best_path, best_cost, nodes_evaluated
 
 class SimulatedAnnealing:
-    """Simulated Annealing for path optimization."""
+    """Simulated Annealing for path optimization.
+    
+    Candidates are generated and scored batch_size at a time: all mutations
+    in a batch start from the same current path, their costs come from one
+    vectorized gather, and the Metropolis test is drawn for the whole batch.
+    """
     
-    def __init__(self, grid: Grid, initial_temp: float = 1000, cooling_rate: float = 0.95):
+    def __init__(self, grid: Grid, initial_temp: float = 1000, cooling_rate: float = 0.95,
+                 batch_size: int = 8):
         self.grid = grid
         self.initial_temp = initial_temp
         self.cooling_rate = cooling_rate
+        self.batch_size = batch_size
     
     def get_path_cost(self, path: List[Tuple[int, int]]) -> int:
         """Calculate total cost of a path."""
-        cost = 0
-        for i in range(len(path) - 1):
-            x, y = path[i + 1]
-            cost += self.grid.get_cost(x, y)
-        return cost
+        return self.grid.path_cost(path)
     
     def search(self, start: Tuple[int, int], goal: Tuple[int, int], 
                initial_path: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], int, int]:
         """Perform simulated annealing search."""
-        current_path = initial_path.copy()
+        # Work on (L, 2) arrays; mutations never modify a path in place
+        current_path = np.asarray(initial_path, dtype=np.int32)
         current_cost = self.get_path_cost(current_path)
-        best_path = current_path.copy()
+        hill_climbing = HillClimbing(self.grid)
+        
+        if self.batch_size > 1:
+            return self._search_batched(goal, hill_climbing, current_path, current_cost)
+        
+        best_path = current_path
         best_cost = current_cost
         
         temperature = self.initial_temp
         nodes_evaluated = 1
         
-        hill_climbing = HillClimbing(self.grid)
-        
         while temperature > 1:
             # Generate neighbor using hill climbing's mutation
             new_path = hill_climbing.mutate_path(current_path)
             nodes_evaluated += 1
             
-            if not new_path or new_path[-1] != goal:
+            if not _ends_at(new_path, goal):
                 continue
             
             new_cost = self.get_path_cost(new_path)
@@ -172,9 +297,45 @@ class SimulatedAnnealing:
                 current_cost = new_cost
                 
                 if current_cost < best_cost:
-                    best_path = current_path.copy()
+                    best_path = current_path
                     best_cost = current_cost
             
             temperature *= self.cooling_rate
         
-        return best_path, best_cost, nodes_evaluated
+        return _to_tuples(best_path), best_cost, nodes_evaluated
+    
+    def _search_batched(self, goal: Tuple[int, int], hill_climbing: HillClimbing,
+                        current_path: np.ndarray, 
+                        current_cost: int) -> Tuple[List[Tuple[int, int]], int, int]:
+        """Simulated annealing loop that evaluates batch_size mutations per step."""
+        best_path = current_path
+        best_cost = current_cost
+        
+        temperature = self.initial_temp
+        nodes_evaluated = 1
+        batch_cooling = self.cooling_rate ** self.batch_size
+        
+        while temperature > 1:
+            candidates = hill_climbing.mutate_path_batch(current_path, self.batch_size)
+            nodes_evaluated += len(candidates)
+            
+            new_costs = self.grid.path_costs(candidates)
+            reaches_goal = np.array([_ends_at(c, goal) for c in candidates])
+            
+            # Improvements give exp(0) = 1 and are always accepted
+            acceptance = np.exp(np.minimum(current_cost - new_costs, 0) / temperature)
+            accepted = np.flatnonzero(reaches_goal & (acceptance > np.random.random(len(candidates))))
+            
+            if len(accepted):
+                best_idx = accepted[np.argmin(new_costs[accepted])]
+                if new_costs[best_idx] < best_cost:
+                    best_path = candidates[best_idx]
+                    best_cost = int(new_costs[best_idx])
+                
+                last = accepted[-1]
+                current_path = candidates[last]
+                current_cost = int(new_costs[last])
+            
+            temperature *= batch_cooling
+        
+        return _to_tuples(best_path), best_cost, nodes_evaluated
@@ -3,8 +3,8 @@ Uninformed search algorithms: BFS and Uniform Cost Search.
 """
 
 from typing import List, Tuple, Dict, Set, Optional
-import heapq
 from collections import deque
+import numpy as np
 from environment.grid import Grid
 
 class Node:
@@ -27,6 +27,39 @@ class Node:
     def __hash__(self):
         return hash((self.x, self.y))
 
+class BucketQueue:
+    """Monotone priority queue for small integer priorities (Dial's algorithm).
+    
+    Push and pop are O(1) amortized. Buckets are addressed modulo their count,
+    which is enough as long as every pushed priority lies between the last
+    popped priority and that priority plus max_step.
+    """
+    
+    def __init__(self, max_step: int):
+        self.buckets = [deque() for _ in range(max_step + 1)]
+        self.min_priority: Optional[int] = None  # set by the first push
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def push(self, priority: int, item):
+        """Add an item; priority must not be below the last popped priority."""
+        if self.min_priority is None:
+            self.min_priority = priority
+        self.buckets[priority % len(self.buckets)].append(item)
+        self.size += 1
+    
+    def pop(self) -> Tuple[int, object]:
+        """Remove and return (priority, item) with the smallest priority."""
+        if self.size == 0:
+            raise IndexError('pop from empty BucketQueue')
+        num_buckets = len(self.buckets)
+        while not self.buckets[self.min_priority % num_buckets]:
+            self.min_priority += 1
+        self.size -= 1
+        return self.min_priority, self.buckets[self.min_priority % num_buckets].popleft()
+
 class UninformedSearch:
     """Base class for uninformed search algorithms."""
     
@@ -43,13 +76,22 @@ class UninformedSearch:
             current = current.parent
         return path[::-1]
     
+    def reconstruct_path_from_ids(self, parent: np.ndarray, node_id: int) -> List[Tuple[int, int]]:
+        """Reconstruct path by following parent node ids (y * width + x) back to -1."""
+        width = self.grid.width
+        path = []
+        while node_id != -1:
+            y, x = divmod(int(node_id), width)
+            path.append((x, y))
+            node_id = parent[node_id]
+        return path[::-1]
+    
     def get_successors(self, node: Node) -> List[Node]:
         """Get valid successor nodes."""
         successors = []
-        for nx, ny in self.grid.get_neighbors(node.x, node.y):
-            if self.grid.is_traversable(nx, ny):
-                cost = node.cost + self.grid.get_cost(nx, ny)
-                successors.append(Node(nx, ny, node, cost, node.time + 1))
+        for nx, ny in self.grid.neighbors[node.y * self.grid.width + node.x]:
+            cost = node.cost + self.grid.get_cost(nx, ny)
+            successors.append(Node(nx, ny, node, cost, node.time + 1))
         return successors
 
 class BFS(UninformedSearch):
@@ -61,28 +103,35 @@ class BFS(UninformedSearch):
         Returns:
             Tuple of (path, cost, nodes_expanded)
         """
-        start_node = Node(start[0], start[1])
-        goal_node = Node(goal[0], goal[1])
+        width = self.grid.width
+        size = width * self.grid.height
+        neighbors = self.grid.neighbors
+        
+        start_id = start[1] * width + start[0]
+        goal_id = goal[1] * width + goal[0]
         
-        if start_node == goal_node:
+        if start_id == goal_id:
             return [start], 0, 0
         
-        frontier = deque([start_node])
-        explored = set()
-        explored.add((start_node.x, start_node.y))
+        visited = np.zeros(size, dtype=np.uint8)
+        parent = np.full(size, -1, dtype=np.int32)
+        frontier = deque([start_id])
+        visited[start_id] = 1
         self.nodes_expanded = 0
         
         while frontier:
             current = frontier.popleft()
             self.nodes_expanded += 1
             
-            if current == goal_node:
-                path = self.reconstruct_path(current)
-                return path, current.cost, self.nodes_expanded
+            if current == goal_id:
+                path = self.reconstruct_path_from_ids(parent, current)
+                return path, self.grid.path_cost(path), self.nodes_expanded
             
-            for successor in self.get_successors(current):
-                if (successor.x, successor.y) not in explored:
-                    explored.add((successor.x, successor.y))
+            for nx, ny in neighbors[current]:
+                successor = ny * width + nx
+                if not visited[successor]:
+                    visited[successor] = 1
+                    parent[successor] = current
                     frontier.append(successor)
         
         return [], float('inf'), self.nodes_expanded
@@ -91,18 +140,23 @@ class UniformCostSearch(UninformedSearch):
     """Uniform Cost Search implementation."""
     
     def search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], int, int]:
-        """Perform UCS search."""
+        """Perform UCS search.
+        
+        Step costs are small integers, so the frontier is a bucket queue
+        sized to the largest terrain cost rather than a binary heap.
+        """
         start_node = Node(start[0], start[1])
         goal_node = Node(goal[0], goal[1])
         
-        frontier = []
-        heapq.heappush(frontier, (0, start_node))
+        max_step = int(np.max(self.grid.cost, where=~self.grid.obstacle, initial=1))
+        frontier = BucketQueue(max_step)
+        frontier.push(0, start_node)
         explored = {}
         explored[(start_node.x, start_node.y)] = 0
         self.nodes_expanded = 0
         
         while frontier:
-            current_cost, current = heapq.heappop(frontier)
+            current_cost, current = frontier.pop()
             self.nodes_expanded += 1
             
             if current == goal_node:
@@ -118,6 +172,6 @@ class UniformCostSearch(UninformedSearch):
                 if (successor.x, successor.y) not in explored or new_cost < explored[(successor.x, successor.y)]:
                     explored[(successor.x, successor.y)] = new_cost
                     successor.cost = new_cost
-                    heapq.heappush(frontier, (new_cost, successor))
+                    frontier.push(new_cost, successor)
         
         return [], float('inf'), self.nodes_expanded
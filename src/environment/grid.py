@@ -13,52 +13,74 @@ class TerrainType(Enum):
     MOUNTAINS = 3
     WATER = 4
 
-class Cell:
-    """Represents a single cell in the grid."""
-    
-    def __init__(self, terrain: TerrainType, is_obstacle: bool = False):
-        self.terrain = terrain
-        self.is_obstacle = is_obstacle
-        self.cost = self._get_terrain_cost()
-        
-    def _get_terrain_cost(self) -> int:
-        """Get movement cost based on terrain type."""
-        costs = {
-            TerrainType.FLAT: 1,
-            TerrainType.HILLS: 2,
-            TerrainType.MOUNTAINS: 3,
-            TerrainType.WATER: 4
-        }
-        return costs[self.terrain]
-    
-    def __str__(self):
-        return f"Cell(terrain={self.terrain.name}, obstacle={self.is_obstacle}, cost={self.cost})"
+# Movement cost indexed by TerrainType.value
+_TERRAIN_COST = np.array([0, 1, 2, 3, 4], dtype=np.uint8)
+
+# 4-connected moves: Up, Right, Down, Left
+_DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# Cost stored for obstacle cells; planners skip any step with this cost
+BLOCKED_COST = int(np.iinfo(np.uint8).max)
+
+# ASCII codes used by Grid.__str__
+_DIGIT_ZERO = ord('0')
+_OBSTACLE_CHAR = ord('X')
 
 class Grid:
-    """2D grid environment for path planning."""
+    """2D grid environment for path planning.
+    
+    Terrain costs and obstacles are stored as two contiguous (height, width)
+    arrays rather than one object per cell. Obstacle cells carry BLOCKED_COST
+    in the cost array, so planners can reject them with one compare.
+    ``terrain_arr`` holds the TerrainType value of every cell (obstacles
+    keep their underlying terrain).
+    ``neighbors[id]`` lists the in-bounds, non-obstacle neighbors of the cell
+    with flat id ``y * width + x``. Entries are computed on first lookup and
+    dropped when an adjacent obstacle changes, so construction does no
+    per-cell work.
+    """
     
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.grid = np.empty((height, width), dtype=object)
-        self._initialize_grid()
-        
-    def _initialize_grid(self):
-        """Initialize grid with flat terrain and no obstacles."""
-        for y in range(self.height):
-            for x in range(self.width):
-                self.grid[y, x] = Cell(TerrainType.FLAT)
+        self.cost = np.ones((height, width), dtype=np.uint8)
+        self.obstacle = np.zeros((height, width), dtype=np.bool_)
+        self.terrain_arr = np.full((height, width), TerrainType.FLAT.value, dtype=np.uint8)
+        # Bumped on every terrain/obstacle change; lets planners key caches on grid state
+        self.version = 0
+        self.neighbors = _NeighborTable(self)
+    
+    @classmethod
+    def from_arrays(cls, terrain: np.ndarray, obstacle: np.ndarray) -> 'Grid':
+        """Build a grid from (height, width) TerrainType values and an obstacle mask."""
+        height, width = terrain.shape
+        grid = cls(width, height)
+        grid.terrain_arr[:] = terrain
+        grid.obstacle[:] = obstacle
+        grid.cost[:] = np.where(grid.obstacle, BLOCKED_COST, _TERRAIN_COST[grid.terrain_arr])
+        grid.version += 1
+        return grid
     
     def set_terrain(self, x: int, y: int, terrain: TerrainType):
         """Set terrain type for a cell."""
         if self.is_valid_position(x, y):
-            self.grid[y, x].terrain = terrain
-            self.grid[y, x].cost = self.grid[y, x]._get_terrain_cost()
+            self.terrain_arr[y, x] = terrain.value
+            if not self.obstacle[y, x]:
+                self.cost[y, x] = _TERRAIN_COST[terrain.value]
+            self.version += 1
     
     def set_obstacle(self, x: int, y: int, is_obstacle: bool = True):
         """Set obstacle status for a cell."""
         if self.is_valid_position(x, y):
-            self.grid[y, x].is_obstacle = is_obstacle
+            self.obstacle[y, x] = is_obstacle
+            if is_obstacle:
+                self.cost[y, x] = BLOCKED_COST
+            else:
+                self.cost[y, x] = _TERRAIN_COST[self.terrain_arr[y, x]]
+            # Cells that can step onto (x, y) must recompute their lists
+            for nx, ny in self.get_neighbors(x, y):
+                self.neighbors.pop(ny * self.width + nx, None)
+            self.version += 1
     
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if position is within grid bounds."""
@@ -68,36 +90,65 @@ class Grid:
         """Check if cell is traversable at given time."""
         if not self.is_valid_position(x, y):
             return False
-        return not self.grid[y, x].is_obstacle
+        return not self.obstacle[y, x]
     
     def get_cost(self, x: int, y: int) -> int:
-        """Get movement cost for a cell."""
+        """Get movement cost for a cell (BLOCKED_COST for obstacles)."""
         if self.is_valid_position(x, y):
-            return self.grid[y, x].cost
+            return int(self.cost[y, x])
         return float('inf')
     
+    def path_cost(self, path) -> int:
+        """Total cost of moving along a path of (x, y) cells.
+        
+        Accepts a list of tuples or an (N, 2) integer array; the starting cell
+        is not charged.
+        """
+        if len(path) < 2:
+            return 0
+        coords = np.asarray(path, dtype=np.int32)
+        return int(self.cost[coords[1:, 1], coords[1:, 0]].sum())
+    
+    def path_costs(self, paths: List[np.ndarray]) -> np.ndarray:
+        """Total costs of several (N, 2) integer paths with a single gather."""
+        lengths = np.fromiter((len(path) for path in paths), dtype=np.int64, count=len(paths))
+        coords = np.concatenate(paths)
+        step_costs = self.cost[coords[:, 1], coords[:, 0]].astype(np.int64)
+        
+        # Sum each path's run of cells, then drop its uncharged starting cell
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.add.reduceat(step_costs, starts) - step_costs[starts]
+    
     def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Get 4-connected neighbors of a cell."""
-        neighbors = []
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Up, Right, Down, Left
-        
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if self.is_valid_position(nx, ny):
-                neighbors.append((nx, ny))
-                
-        return neighbors
+        return [(x + dx, y + dy) for dx, dy in _DIRECTIONS
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height]
     
     def __str__(self):
         """String representation of the grid for debugging."""
-        result = []
-        for y in range(self.height):
-            row = []
-            for x in range(self.width):
-                cell = self.grid[y, x]
-                if cell.is_obstacle:
-                    row.append('X')
-                else:
-                    row.append(str(cell.terrain.value))
-            result.append(' '.join(row))
-        return '\n'.join(result)
+        chars = np.where(self.obstacle, _OBSTACLE_CHAR, self.terrain_arr + _DIGIT_ZERO)
+        
+        # Cells in even columns, separators in odd ones; each row ends in a newline
+        text = np.full((self.height, 2 * self.width), ord(' '), dtype=np.uint8)
+        text[:, 0::2] = chars
+        text[:, -1] = ord('\n')
+        return text.tobytes().decode('ascii')[:-1]
+
+
+class _NeighborTable(dict):
+    """Lazily filled map from flat cell id to its traversable neighbors."""
+    
+    def __init__(self, grid: Grid):
+        super().__init__()
+        self.grid = grid
+    
+    def __reduce__(self):
+        # Pickle without the cached lists; the copy refills them on demand
+        return _NeighborTable, (self.grid,)
+    
+    def __missing__(self, cell_id: int) -> List[Tuple[int, int]]:
+        grid = self.grid
+        y, x = divmod(cell_id, grid.width)
+        neighbors = [(nx, ny) for nx, ny in grid.get_neighbors(x, y) if not grid.obstacle[ny, nx]]
+        self[cell_id] = neighbors
+        return neighbors
@@ -2,7 +2,7 @@
 Dynamic obstacle management for the grid environment.
 """
 
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Iterable, Optional
 import numpy as np
 
 class MovingObstacle:
@@ -17,41 +17,82 @@ class MovingObstacle:
         self.obstacle_id = obstacle_id
         self.schedule = sorted(schedule, key=lambda x: x[0])  # Sort by time
         self.max_time = max(t for t, x, y in self.schedule)
+        
+        # Schedule as parallel arrays for binary search over time
+        self.ts = np.asarray([t for t, x, y in self.schedule], dtype=np.int32)
+        self.xs = np.asarray([x for t, x, y in self.schedule], dtype=np.int32)
+        self.ys = np.asarray([y for t, x, y in self.schedule], dtype=np.int32)
     
     def get_position_at_time(self, time: int) -> Tuple[int, int]:
         """Get obstacle position at given time using linear interpolation."""
-        if time <= self.schedule[0][0]:
-            return self.schedule[0][1], self.schedule[0][2]
-        if time >= self.schedule[-1][0]:
-            return self.schedule[-1][1], self.schedule[-1][2]
+        if time <= self.ts[0]:
+            return int(self.xs[0]), int(self.ys[0])
+        if time >= self.ts[-1]:
+            return int(self.xs[-1]), int(self.ys[-1])
+        
+        # First waypoint at or after time; the segment starts one before it
+        i = int(np.searchsorted(self.ts, time))
+        t1, x1, y1 = int(self.ts[i - 1]), int(self.xs[i - 1]), int(self.ys[i - 1])
+        t2, x2, y2 = int(self.ts[i]), int(self.xs[i]), int(self.ys[i])
+        
+        ratio = (time - t1) / (t2 - t1)
+        x = int(round(x1 + ratio * (x2 - x1)))
+        y = int(round(y1 + ratio * (y2 - y1)))
+        return x, y
+    
+    def get_positions_at_times(self, times) -> Tuple[np.ndarray, np.ndarray]:
+        """Get obstacle positions at many times at once.
+        
+        Batched form of get_position_at_time.
         
-        # Find the segment containing the time
-        for i in range(len(self.schedule) - 1):
-            t1, x1, y1 = self.schedule[i]
-            t2, x2, y2 = self.schedule[i + 1]
-            
-            if t1 <= time <= t2:
-                # Linear interpolation
-                if t2 == t1:
-                    return x1, y1
-                ratio = (time - t1) / (t2 - t1)
-                x = int(round(x1 + ratio * (x2 - x1)))
-                y = int(round(y1 + ratio * (y2 - y1)))
-                return x, y
+        Returns:
+            Tuple of (xs, ys) arrays, one entry per time
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(self.ts) == 1:
+            return np.full(times.shape, self.xs[0]), np.full(times.shape, self.ys[0])
         
-        return self.schedule[-1][1], self.schedule[-1][2]
+        end = np.clip(np.searchsorted(self.ts, times), 1, len(self.ts) - 1)
+        begin = end - 1
+        span = self.ts[end] - self.ts[begin]
+        ratio = (times - self.ts[begin]) / np.where(span > 0, span, 1)
+        
+        xs = np.rint(self.xs[begin] + ratio * (self.xs[end] - self.xs[begin])).astype(np.int64)
+        ys = np.rint(self.ys[begin] + ratio * (self.ys[end] - self.ys[begin])).astype(np.int64)
+        
+        # Clamp outside the schedule; the start clamp wins when both apply
+        after = times >= self.ts[-1]
+        xs[after], ys[after] = self.xs[-1], self.ys[-1]
+        before = times <= self.ts[0]
+        xs[before], ys[before] = self.xs[0], self.ys[0]
+        return xs, ys
 
 class DynamicGrid:
     """Extends Grid with dynamic obstacle support."""
     
     def __init__(self, base_grid):
         self.base_grid = base_grid
+        
+        # Hot base-grid attributes bound directly to skip __getattr__. Arrays and
+        # tables are updated in place; mutable counters like version are not bound.
+        self.width = base_grid.width
+        self.height = base_grid.height
+        self.cost = base_grid.cost
+        self.obstacle = base_grid.obstacle
+        self.neighbors = base_grid.neighbors
+        self.get_cost = base_grid.get_cost
+        self.get_neighbors = base_grid.get_neighbors
+        self.path_cost = base_grid.path_cost
+        self.path_costs = base_grid.path_costs
         self.moving_obstacles: Dict[str, MovingObstacle] = {}
         self.dynamic_obstacles: Set[Tuple[int, int]] = set()
+        # Time step dynamic_obstacles was last computed for
+        self._cached_time: Optional[int] = None
     
     def add_moving_obstacle(self, obstacle_id: str, schedule: List[Tuple[int, int, int]]):
         """Add a moving obstacle with a schedule."""
         self.moving_obstacles[obstacle_id] = MovingObstacle(obstacle_id, schedule)
+        self._cached_time = None
     
     def update_dynamic_obstacles(self, time: int):
         """Update dynamic obstacle positions for the given time."""
@@ -59,15 +100,30 @@ class DynamicGrid:
         for obstacle in self.moving_obstacles.values():
             x, y = obstacle.get_position_at_time(time)
             self.dynamic_obstacles.add((x, y))
+        self._cached_time = time
+    
+    def occupied_cells(self, times: Iterable[int]) -> Dict[int, Set[Tuple[int, int]]]:
+        """Get the positions of all moving obstacles at each of the given times."""
+        times = list(times)
+        occupied = {t: set() for t in times}
+        for obstacle in self.moving_obstacles.values():
+            xs, ys = obstacle.get_positions_at_times(times)
+            for t, x, y in zip(times, xs.tolist(), ys.tolist()):
+                occupied[t].add((x, y))
+        return occupied
     
     def is_traversable(self, x: int, y: int, time: int = 0) -> bool:
         """Check if cell is traversable at given time considering dynamic obstacles."""
         if not self.base_grid.is_traversable(x, y):
             return False
         
-        self.update_dynamic_obstacles(time)
+        if time != self._cached_time:
+            self.update_dynamic_obstacles(time)
         return (x, y) not in self.dynamic_obstacles
     
     def __getattr__(self, name):
-        """Delegate other attributes to base grid."""
+        """Delegate rarely used attributes to base grid."""
+        if name == 'base_grid':
+            # Not set yet, e.g. while unpickling; delegating would recurse
+            raise AttributeError(name)
         return getattr(self.base_grid, name)
@@ -2,13 +2,19 @@
 Main CLI application for autonomous delivery agent.
 """
 
+import contextlib
+import glob
+import io
+import os
+import sys
 import click
 import time
-from typing import Dict
-from environment.grid import Grid, TerrainType, DynamicGrid
-from environment.obstacles import MovingObstacle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from typing import Dict, List, Tuple
+from environment.grid import Grid, TerrainType
+from environment.obstacles import MovingObstacle, DynamicGrid
 from agent.delivery_agent import DeliveryAgent
-from utils.visualizer import GridVisualizer
 
 @click.group()
 def cli():
@@ -25,10 +31,14 @@ def cli():
               help='Heuristic for A*')
 @click.option('--fuel', default=100, help='Initial fuel')
 @click.option('--time-limit', default=100, help='Time limit')
-def plan(map_file, algorithm, heuristic, fuel, time_limit):
+@click.option('--no-viz', is_flag=True, help='Skip path visualization')
+def plan(map_file, algorithm, heuristic, fuel, time_limit, no_viz):
     """Plan and execute a delivery mission."""
     # Load map
-    grid, start, goal, moving_obstacles = load_map(map_file)
+    try:
+        grid, start, goal, moving_obstacles = load_map(map_file)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e))
     dynamic_grid = DynamicGrid(grid)
     
     # Add moving obstacles
@@ -41,40 +51,195 @@ def plan(map_file, algorithm, heuristic, fuel, time_limit):
     print(f"Starting delivery with {algorithm} algorithm")
     start_time = time.time()
     
-    metrics = agent.run_delivery(algorithm, dynamic_grid, 'astar')
+    # --heuristic only shapes an initial A* plan; replans around moving obstacles use D* Lite
+    metrics = agent.run_delivery(algorithm, dynamic_grid, 'astar', heuristic)
     
     end_time = time.time()
     metrics['execution_time'] = end_time - start_time
     
-    # Display results
-    print("\n=== Delivery Results ===")
-    for key, value in metrics.items():
-        print(f"{key}: {value}")
+    # Display results in a single write
+    sys.stdout.write("\n=== Delivery Results ===\n" +
+                     "\n".join(f"{key}: {value}" for key, value in metrics.items()) + "\n")
     
-    # Visualize if possible
-    try:
+    # Visualize if possible; matplotlib is only imported when needed
+    if not no_viz:
+        try:
+            from utils.visualizer import GridVisualizer
+        except ImportError:
+            print("Visualization not available")
+            return
         visualizer = GridVisualizer(grid)
         visualizer.visualize_path(agent.path if agent.path else [], start, goal)
-    except:
-        print("Visualization not available")
+
+# Binary map format: a little-endian header followed by one byte per cell,
+# row-major, holding (TerrainType.value << 4) | obstacle bit. Bits 1-3 are reserved.
+_MAP_MAGIC = b'DMAP'
+_MAP_HEADER_DTYPE = np.dtype([('magic', 'S4'), ('height', '<u4'), ('width', '<u4'),
+                              ('sx', '<u2'), ('sy', '<u2'), ('gx', '<u2'), ('gy', '<u2')])
+_TERRAIN_SHIFT = 4
+_OBSTACLE_BIT = 1
 
 def load_map(map_file: str):
-    """Load map from file."""
-    # Simplified map loading - implement based on your format
-    # This is a placeholder implementation
-    grid = Grid(10, 10)
-    start = (0, 0)
-    goal = (9, 9)
+    """Load map from file.
+    
+    Binary maps (see save_map) are memory-mapped and decoded with array
+    operations, with no per-cell Python parsing. Anything else is read as
+    the text format used by the maps/ directory.
+    """
+    with open(map_file, 'rb') as f:
+        is_binary = f.read(len(_MAP_MAGIC)) == _MAP_MAGIC
+    if not is_binary:
+        return _load_text_map(map_file)
+    
+    buf = np.memmap(map_file, dtype=np.uint8, mode='r')
+    header_size = _MAP_HEADER_DTYPE.itemsize
+    if len(buf) < header_size:
+        raise ValueError(f"{map_file}: truncated map header")
+    
+    header = np.frombuffer(buf[:header_size], dtype=_MAP_HEADER_DTYPE)[0]
+    height, width = int(header['height']), int(header['width'])
+    if len(buf) != header_size + height * width:
+        raise ValueError(f"{map_file}: expected {height}x{width} cells")
+    
+    payload = buf[header_size:].reshape(height, width)
+    grid = _grid_from_cells(map_file, payload >> _TERRAIN_SHIFT,
+                            (payload & _OBSTACLE_BIT).astype(np.bool_))
+    start = (int(header['sx']), int(header['sy']))
+    goal = (int(header['gx']), int(header['gy']))
+    _check_endpoints(map_file, grid, start, goal)
+    moving_obstacles = {}
+    
+    return grid, start, goal, moving_obstacles
+
+def _load_text_map(map_file: str):
+    """Parse a text map.
+    
+    The first line is "width height", followed by one row per line of terrain
+    values (1-4) or X for obstacles. Optional lines: "START x y", "GOAL x y"
+    and "MOVING id t,x,y;t,x,y;...". Start and goal default to opposite corners.
+    """
+    with open(map_file) as f:
+        lines = [line.split() for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"{map_file}: empty map")
+    
+    width, height = _int_fields(map_file, lines[0], 'width height')
+    if width < 1 or height < 1:
+        raise ValueError(f"{map_file}: map must be at least 1x1")
+    if len(lines) <= height or any(len(row) != width for row in lines[1:height + 1]):
+        raise ValueError(f"{map_file}: expected {height} rows of {width} cells")
+    rows = np.array(lines[1:height + 1])
+    
+    obstacle = rows == 'X'
+    terrain = np.where(obstacle, str(TerrainType.FLAT.value), rows)
+    if not np.char.isdigit(terrain).all():
+        raise ValueError(f"{map_file}: unknown terrain type")
+    grid = _grid_from_cells(map_file, terrain.astype(np.int64), obstacle)
+    
+    start, goal = (0, 0), (width - 1, height - 1)
     moving_obstacles = {}
+    for fields in lines[height + 1:]:
+        if fields[0] == 'START':
+            start = _int_fields(map_file, fields, 'START x y')
+        elif fields[0] == 'GOAL':
+            goal = _int_fields(map_file, fields, 'GOAL x y')
+        elif fields[0] == 'MOVING':
+            _check_field_count(map_file, fields, 'MOVING id waypoints')
+            waypoints = [_int_fields(map_file, entry.split(','), 't,x,y')
+                         for entry in fields[2].split(';')]
+            moving_obstacles[fields[1]] = waypoints
     
+    _check_endpoints(map_file, grid, start, goal)
     return grid, start, goal, moving_obstacles
 
+def _check_field_count(map_file: str, fields: List[str], usage: str):
+    """Reject a map line whose field count differs from usage, e.g. "START x y" or "t,x,y"."""
+    if len(fields) != len(usage.replace(',', ' ').split()):
+        separator = ',' if ',' in usage else ' '
+        raise ValueError(f"{map_file}: expected '{usage}', got '{separator.join(fields)}'")
+
+def _int_fields(map_file: str, fields: List[str], usage: str) -> Tuple[int, ...]:
+    """Integer values of a map line laid out as usage; a leading keyword is skipped."""
+    _check_field_count(map_file, fields, usage)
+    values = fields[1:] if usage.split()[0].isupper() else fields
+    try:
+        return tuple(int(value) for value in values)
+    except ValueError:
+        raise ValueError(f"{map_file}: expected integers in '{usage}'") from None
+
+def _grid_from_cells(map_file: str, terrain: np.ndarray, obstacle: np.ndarray) -> Grid:
+    """Validate decoded terrain values and build the grid."""
+    values = [t.value for t in TerrainType]
+    if terrain.size and (terrain.min() < min(values) or terrain.max() > max(values)):
+        raise ValueError(f"{map_file}: unknown terrain type")
+    return Grid.from_arrays(terrain, obstacle)
+
+def _check_endpoints(map_file: str, grid: Grid, start: Tuple[int, int], goal: Tuple[int, int]):
+    """Reject start/goal cells outside the grid; planners index by them unchecked."""
+    for name, (x, y) in (('start', start), ('goal', goal)):
+        if not grid.is_valid_position(x, y):
+            raise ValueError(f"{map_file}: {name} {(x, y)} is outside the {grid.width}x{grid.height} grid")
+
+def save_map(map_file: str, grid: Grid, start: Tuple[int, int], goal: Tuple[int, int]):
+    """Write a grid in the binary format read by load_map."""
+    header = np.array([(_MAP_MAGIC, grid.height, grid.width, start[0], start[1], goal[0], goal[1])],
+                      dtype=_MAP_HEADER_DTYPE)
+    payload = (grid.terrain_arr << _TERRAIN_SHIFT) | grid.obstacle.astype(np.uint8)
+    with open(map_file, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(payload.astype(np.uint8).tobytes())
+
+# Planners compared by experiment; annealing needs an initial path to refine
+EXPERIMENT_ALGORITHMS = ('bfs', 'ucs', 'astar', 'hillclimbing')
+
+def _run_one(task: Tuple[str, str, str]) -> Tuple[str, str, Dict]:
+    """Run one (map, algorithm, heuristic) delivery; module-level so workers can unpickle it."""
+    map_path, algorithm, heuristic = task
+    try:
+        grid, start, goal, moving_obstacles = load_map(map_path)
+    except (OSError, ValueError) as e:
+        return map_path, algorithm, {'error': str(e)}
+    
+    dynamic_grid = DynamicGrid(grid)
+    for obs_id, schedule in moving_obstacles.items():
+        dynamic_grid.add_moving_obstacle(obs_id, schedule)
+    # Sweep workers already fill the CPUs; nested restart pools would oversubscribe them
+    agent = DeliveryAgent(start, goal, grid, local_search_workers=1)
+    
+    # The agent narrates every move; keep worker output out of the report
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics = agent.run_delivery(algorithm, dynamic_grid, 'astar', heuristic)
+    metrics['execution_time'] = time.time() - start_time
+    return map_path, algorithm, metrics
+
 @cli.command()
 @click.option('--map-dir', default='maps', help='Directory containing test maps')
-def experiment(map_dir):
+@click.option('--heuristic', default='manhattan',
+              type=click.Choice(['manhattan', 'euclidean', 'chebyshev']),
+              help='Heuristic for A*')
+@click.option('--workers', default=None, type=int, help='Worker processes (default: CPU count)')
+def experiment(map_dir, heuristic, workers):
     """Run comparative experiments on all algorithms."""
-    # Implement experimental comparison
-    pass
+    tasks = [(map_path, algorithm, heuristic)
+             for map_path in sorted(glob.glob(os.path.join(map_dir, '*.map')))
+             for algorithm in EXPERIMENT_ALGORITHMS]
+    if not tasks:
+        raise click.ClickException(f"No .map files found in {map_dir}")
+    
+    # Each (map, algorithm) pair is independent; run them across processes
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(_run_one, tasks))
+    
+    lines = ["=== Experiment Results ==="]
+    for map_path, algorithm, metrics in results:
+        if 'error' in metrics:
+            lines.append(f"{metrics['error']} ({algorithm} skipped)")
+            continue
+        lines.append(f"{map_path} {algorithm}: success={metrics['success']} "
+                     f"cost={metrics['total_cost']} nodes={metrics['total_nodes_expanded']} "
+                     f"replans={metrics['replan_count']} time={metrics['execution_time']:.3f}s")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == '__main__':
     cli()
@@ -2,57 +2,96 @@
 Visualization utilities for grid and paths.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import numpy as np
+import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
 from typing import List, Tuple
 from environment.grid import Grid, TerrainType
 
+_TERRAIN_COLORS = {
+    TerrainType.FLAT: 'lightgreen',
+    TerrainType.HILLS: 'orange',
+    TerrainType.MOUNTAINS: 'brown',
+    TerrainType.WATER: 'lightblue'
+}
+_CELL_ALPHA = 0.7
+
+def _to_rgba8(color: str) -> np.ndarray:
+    """Named color as uint8 RGBA with the cell alpha applied."""
+    return np.round(np.array(mcolors.to_rgba(color, alpha=_CELL_ALPHA)) * 255).astype(np.uint8)
+
+# RGBA per TerrainType.value, built once; index 0 is unused
+_TERRAIN_RGBA = np.zeros((max(t.value for t in TerrainType) + 1, 4), dtype=np.uint8)
+for _terrain, _color in _TERRAIN_COLORS.items():
+    _TERRAIN_RGBA[_terrain.value] = _to_rgba8(_color)
+_OBSTACLE_RGBA = _to_rgba8('black')
+
 class GridVisualizer:
-    """Visualize grid environment and paths."""
+    """Visualize grid environment and paths.
+    
+    Per-cell cost labels are only drawn for grids of at most label_threshold
+    cells; on larger grids they dominate render time and are unreadable.
+    """
     
-    def __init__(self, grid: Grid):
+    def __init__(self, grid: Grid, label_threshold: int = 400):
         self.grid = grid
+        self.label_threshold = label_threshold
+        # pyplot pulls in a GUI backend; import it only once a figure is needed
+        import matplotlib.pyplot as plt
         self.fig, self.ax = plt.subplots(figsize=(10, 10))
     
+    def _cell_centers(self, cells) -> np.ndarray:
+        """Display coordinates of cell centers for (x, y) cells, row 0 at the top."""
+        coords = np.asarray(cells, dtype=np.int32).reshape(-1, 2)
+        centers = np.empty(coords.shape, dtype=np.float32)
+        centers[:, 0] = coords[:, 0] + np.float32(0.5)
+        centers[:, 1] = np.float32(self.grid.height - 0.5) - coords[:, 1]
+        return centers
+    
     def visualize_path(self, path: List[Tuple[int, int]], 
                       start: Tuple[int, int], goal: Tuple[int, int]):
         """Visualize grid with path."""
-        # Create grid visualization
-        terrain_colors = {
-            TerrainType.FLAT: 'lightgreen',
-            TerrainType.HILLS: 'orange',
-            TerrainType.MOUNTAINS: 'brown',
-            TerrainType.WATER: 'lightblue'
-        }
+        # One image for the whole grid instead of a patch per cell
+        terrain_values = self.grid.terrain_arr
+        rgba = _TERRAIN_RGBA[terrain_values]
+        rgba[self.grid.obstacle] = _OBSTACLE_RGBA
+        
+        # Row 0 is drawn at the top
+        self.ax.imshow(rgba, origin='upper', interpolation='nearest',
+                       extent=(0, self.grid.width, 0, self.grid.height))
+        
+        # Cell borders as one collection of full-length grid lines
+        width, height = self.grid.width, self.grid.height
+        columns = [((x, 0), (x, height)) for x in range(width + 1)]
+        rows = [((0, y), (width, y)) for y in range(height + 1)]
+        self.ax.add_collection(LineCollection(columns + rows, colors='black',
+                                              linewidths=1, alpha=_CELL_ALPHA))
         
-        for y in range(self.grid.height):
-            for x in range(self.grid.width):
-                cell = self.grid.grid[y, x]
-                color = terrain_colors[cell.terrain]
-                
-                # Darker color for obstacles
-                if cell.is_obstacle:
-                    color = 'black'
-                
-                rect = patches.Rectangle((x, self.grid.height - y - 1), 1, 1, 
-                                       linewidth=1, edgecolor='black', 
-                                       facecolor=color, alpha=0.7)
-                self.ax.add_patch(rect)
-                
-                # Add cost text
-                self.ax.text(x + 0.5, self.grid.height - y - 0.5, str(cell.cost),
-                           ha='center', va='center', fontsize=8)
+        # Add cost text
+        title = 'Delivery Agent Path Planning'
+        show_labels = self.grid.width * self.grid.height <= self.label_threshold
+        if show_labels:
+            # Only label cells that differ from the most common cost; the
+            # common one is named in the title instead of on every cell
+            default_value = int(np.argmax(np.bincount(terrain_values.ravel())))
+            title += f' (unlabelled cells cost {default_value})'
+            
+            label_text = tuple(str(value) for value in range(len(_TERRAIN_RGBA)))
+            add_text = self.ax.text
+            ys, xs = np.nonzero(terrain_values != default_value)
+            centers = self._cell_centers(np.column_stack((xs, ys)))
+            for (x, y), value in zip(centers.tolist(), terrain_values[ys, xs].tolist()):
+                add_text(x, y, label_text[value], ha='center', va='center', fontsize=8)
         
         # Plot path
         if path:
-            path_x = [p[0] + 0.5 for p in path]
-            path_y = [self.grid.height - p[1] - 0.5 for p in path]
-            self.ax.plot(path_x, path_y, 'r-', linewidth=2, label='Path')
-            self.ax.plot(path_x, path_y, 'ro', markersize=4)
+            points = self._cell_centers(path)
+            segments = np.stack((points[:-1], points[1:]), axis=1)
+            self.ax.add_collection(LineCollection(segments, colors='r', linewidths=2, label='Path'))
+            self.ax.scatter(points[:, 0], points[:, 1], s=16, c='r')
         
         # Mark start and goal
-        start_x, start_y = start[0] + 0.5, self.grid.height - start[1] - 0.5
-        goal_x, goal_y = goal[0] + 0.5, self.grid.height - goal[1] - 0.5
+        (start_x, start_y), (goal_x, goal_y) = self._cell_centers((start, goal))
         
         self.ax.plot(start_x, start_y, 'gs', markersize=10, label='Start')
         self.ax.plot(goal_x, goal_y, 'bs', markersize=10, label='Goal')
@@ -61,8 +100,9 @@ class GridVisualizer:
         self.ax.set_ylim(0, self.grid.height)
         self.ax.set_aspect('equal')
         self.ax.legend()
-        self.ax.set_title('Delivery Agent Path Planning')
+        self.ax.set_title(title)
         
+        import matplotlib.pyplot as plt
         plt.show()
 
 # Additional utility files would include logger.py, map_loader.py, etc.
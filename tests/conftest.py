@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules live at the top level of src/ (see package_dir in setup.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
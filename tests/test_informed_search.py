@@ -0,0 +1,21 @@
+"""
+Regression checks for the A* search core.
+"""
+
+import numpy as np
+from environment.grid import Grid, TerrainType
+from algorithms.informed_search import _HEURISTIC_IDS, _astar_core
+
+# The core as plain Python, which is what runs when Numba is not installed
+_astar_core_py = getattr(_astar_core, 'py_func', _astar_core)
+
+def test_uncompiled_core_handles_f_values_past_uint8():
+    grid = Grid(300, 1)
+    grid.set_terrain(5, 0, TerrainType.HILLS)
+    expected = 299 + int(grid.cost[0, 5]) - 1
+    
+    for name, h_id in _HEURISTIC_IDS.items():
+        h_cache = np.full(grid.width * grid.height, -1.0, dtype=np.float32)
+        _, goal_id, path_cost, _ = _astar_core_py(grid.cost, 0, 0, 299, 0, h_id, h_cache)
+        assert goal_id == 299, name
+        assert path_cost == expected, name